@@ -11,10 +11,20 @@
 # documentation root, use os.path.abspath to make it absolute, like shown here.
 #
 import os
+import re
 import sys
 
 sys.path.insert(0, os.path.abspath(".."))  # isort:skip
-import geolib_plus  # isort:skip
+
+
+def read_version() -> str:
+    """Read the package version without importing geolib_plus."""
+    init_file = os.path.join(
+        os.path.dirname(__file__), "..", "geolib_plus", "__init__.py"
+    )
+    with open(init_file) as f:
+        return re.search(r'^__version__ = "(.*)"', f.read(), re.MULTILINE).group(1)
+
 
 # -- Project information -----------------------------------------------------
 
@@ -69,9 +79,21 @@ html_static_path = ["_static"]
 
 # -- Added
 # The short X.Y version.
-version = geolib_plus.__version__
+version = read_version()
 # The full version, including alpha/beta/rc tags.
-release = geolib_plus.__version__
+release = version
+
+# Heavy dependencies are mocked, autodoc only needs the docstrings. numpy is
+# not mocked as it is used in the pydantic field types.
+autodoc_mock_imports = [
+    "scipy",
+    "pandas",
+    "pyproj",
+    "lxml",
+    "matplotlib",
+    "shapely",
+    "netCDF4",
+]
 
 # If true, the current module name will be prepended to all description
 # unit titles (such as .. function::).
@@ -97,7 +119,7 @@ html_theme_options = {
 }
 
 # Custom sidebar templates, maps document names to template names.
-html_sidebars: {
+html_sidebars = {
     "**": [
         "about.html",
         "navigation.html",
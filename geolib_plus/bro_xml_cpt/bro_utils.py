@@ -8,11 +8,13 @@ Functions used in the reading of bro_xml cpts
 import logging
 import mmap
 import pickle
-from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO, StringIO
 from os import name, stat
 from os.path import exists, splitext
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, TypeVar, Union
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
 from zipfile import ZipFile
 
 import numpy as np
@@ -31,23 +33,51 @@ from .validate_bro import validate_bro_cpt
 
 # Types not included in typing
 PandasDataFrame = TypeVar("pandas.core.frame.DataFrame")
+NumpyArray = TypeVar("numpy.ndarray")
 # Constants for XML parsing
 searchstring = b"<gml:featureMember>"
 footer = b"</gml:FeatureCollection>"
 
 req_columns = ["penetrationLength", "coneResistance", "localFriction", "frictionRatio"]
 
-
-ns = "{http://www.broservices.nl/xsd/cptcommon/1.1}"
-ns2 = "{http://www.broservices.nl/xsd/dscpt/1.1}"
-ns3 = "{http://www.opengis.net/gml/3.2}"
-ns4 = "{http://www.broservices.nl/xsd/brocommon/3.0}"
-ns5 = "{http://www.opengis.net/om/2.0}"
+nsmap = {
+    "cptcommon": "http://www.broservices.nl/xsd/cptcommon/1.1",
+    "dscpt": "http://www.broservices.nl/xsd/dscpt/1.1",
+    "gml": "http://www.opengis.net/gml/3.2",
+    "brocommon": "http://www.broservices.nl/xsd/brocommon/3.0",
+    "om": "http://www.opengis.net/om/2.0",
+}
+# Tag prefixes of the namespaces of the parsed elements
+ns = "{%s}" % nsmap["cptcommon"]
+ns2 = "{%s}" % nsmap["dscpt"]
+ns4 = "{%s}" % nsmap["brocommon"]
+
+# Compiled XPath expressions, evaluated on the parsed elements
+xpath_srs_name = etree.XPath(
+    "string(.//gml:Point[1]/@srsName)", namespaces=nsmap, smart_strings=False
+)
+xpath_pos = etree.XPath("string(.//gml:pos[1])", namespaces=nsmap, smart_strings=False)
+xpath_result_time = etree.XPath(".//om:resultTime", namespaces=nsmap, smart_strings=False)
+xpath_time_position = etree.XPath(
+    ".//gml:timePosition/text()", namespaces=nsmap, smart_strings=False
+)
+xpath_values = etree.XPath(
+    ".//cptcommon:values/text()", namespaces=nsmap, smart_strings=False
+)
+xpath_avail_columns = etree.XPath(
+    "descendant-or-self::cptcommon:parameters/*[text()='ja']", namespaces=nsmap
+)
 
 nodata = -999999
 to_epsg = "28992"
 
 
+@lru_cache(maxsize=32)
+def _get_transformer(from_epsg: str) -> pyproj.Transformer:
+    """Return the (cached) transformer from the given epsg code to EPSG:28992."""
+    return pyproj.Transformer.from_crs(f"epsg:{from_epsg}", f"epsg:{to_epsg}")
+
+
 class XMLBroColumnValues(BaseModel):
     penetrationLength: Union[Iterable, None] = None
     depth: Union[Iterable, None] = None
@@ -89,17 +119,34 @@ class XMLBroFullData(XMLBroColumnValues):
     cone_penetrometer_type: Optional[str]
     cpt_standard: Optional[str]
     result_time: Optional[str]
-    dataframe: Optional[PandasDataFrame]
+    # 2d array of the available columns, stored column-major so that each
+    # column is a contiguous array
+    data: Optional[NumpyArray]
+    column_index: Optional[Dict[str, int]]
 
     @property
     def columns_string_list(self):
         return list(dict(XMLBroColumnValues()).keys())
 
+    @property
+    def dataframe(self) -> Optional[PandasDataFrame]:
+        """DataFrame view of the data, the columns are the available columns."""
+        if self.data is None:
+            return None
+        return pd.DataFrame(self.data, columns=list(self.column_index))
+
+    def get_column(self, column: str) -> Optional[NumpyArray]:
+        """Return the data of a column, None if the column is not available."""
+        index = self.column_index.get(column)
+        if index is None:
+            return None
+        return self.data[:, index]
+
 
 class XMLBroCPTReader(CptReader):
-    bro_data: XMLBroFullData = XMLBroFullData()
-    water_measurement_type: List = []
-    bro_dataframe_map: Dict[str, str] = {
+    bro_data: XMLBroFullData
+    water_measurement_type: List
+    bro_dataframe_map: ClassVar[Dict[str, str]] = {
         "penetration_length": "penetrationLength",
         "depth": "depth",
         "time": "elapsedTime",
@@ -127,6 +174,10 @@ class XMLBroCPTReader(CptReader):
         "friction_nbr": "frictionRatio",
     }
 
+    def __init__(self):
+        self.bro_data = XMLBroFullData()
+        self.water_measurement_type = []
+
     @property
     def __water_measurement_types(self):
         return [
@@ -135,83 +186,124 @@ class XMLBroCPTReader(CptReader):
             "porePressureU3",
         ]
 
+    @property
+    def __parsed_tags(self) -> List[str]:
+        return [
+            ns4 + "broId",
+            ns2 + "cptStandard",
+            ns + "offset",
+            ns + "localVerticalReferencePoint",
+            ns + "verticalDatum",
+            ns + "qualityClass",
+            ns + "conePenetrometerType",
+            ns + "predrilledDepth",
+            ns + "coneSurfaceQuotient",
+            ns2 + "deliveredLocation",
+            ns + "conePenetrationTest",
+        ]
+
     @staticmethod
-    def xml_to_byte_string(fn: Path) -> bytes:
+    def xml_to_mmap(fn: Path) -> mmap.mmap:
         """
-        Opens an xml-file and returns a byte-string
+        Opens an xml-file and returns a read-only memory map of the file,
+        the file is paged in on demand while it is parsed.
         :param fn: xml file name
-        :return: byte-string of the xml file
+        :return: memory map of the xml file
         """
         ext = splitext(fn)[1]
         if ext == ".xml":
-            with open(fn, "r") as f:
+            with open(fn, "rb") as f:
                 # memory-map the file, size 0 means whole file
-                xml_bytes = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)[:]
-        return xml_bytes
-
-    def search_values_in_root(self, root: _Element, search_item: str) -> str:
-        for loc in root.iter(search_item):
-            return loc.text
+                xml_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return xml_mmap
 
     def find_availed_data_columns(self, root: _Element) -> List:
         """Find which columns are not empty."""
-        avail_columns = []
-        for parameters in root.iter(ns + "parameters"):
-            for parameter in parameters:
-                if parameter.text == "ja":
-                    avail_columns.append(parameter.tag[len(ns) :])
-        return avail_columns
+        return [parameter.tag[len(ns) :] for parameter in xpath_avail_columns(root)]
 
-    def parse_bro_xml(self, xml: bytes):
+    def parse_bro_xml(self, xml: Union[bytes, mmap.mmap]):
         """
         Populates class with xml data. No interpretation of results occurs
         at this function. This is simply reading the xml.
-        TODO Replace iter by single search as iter can give multiple results
+        The xml is read in a single streaming pass, the contents of the parsed
+        elements are cleared after they are read.
 
-        :param xml: XML bytes
+        :param xml: XML bytes or memory map of the xml file
+        :raises ValueError: if a row of the data has a wrong number of values
         """
-        root = etree.fromstring(xml)
-
-        # Location
-        x, y = self.parse_xml_location(xml)
-        self.bro_data.location_x = float(x)
-        self.bro_data.location_y = float(y)
-
-        # fill in the data structure from bro
-        self.get_all_data_from_bro(root=root)
-
-        # Find which columns are not empty
-        avail_columns = self.find_availed_data_columns(root=root)
+        if isinstance(xml, bytes):
+            xml = BytesIO(xml)
+        # start from empty data, nothing is kept from a previous cpt
+        self.bro_data = XMLBroFullData()
+        # if predrill does not exist it is zero
+        self.bro_data.predrilled_z = 0.0
+        avail_columns = []
+        values = None
+        for _, element in etree.iterparse(
+            xml,
+            events=("end",),
+            tag=self.__parsed_tags + [ns + "parameters"],
+            huge_tree=True,
+            remove_blank_text=True,
+            resolve_entities=False,
+        ):
+            if element.tag == ns + "parameters":
+                # Find which columns are not empty
+                avail_columns = self.find_availed_data_columns(root=element)
+            else:
+                # fill in the data structure from bro
+                self.__parse_element(element)
+                if element.tag == ns + "conePenetrationTest":
+                    cpt_values = xpath_values(element)
+                    if cpt_values:
+                        values = cpt_values[-1]
+            element.clear()
 
         # Determine if all data is available
         self.are_all_required_data_available(avail_columns=avail_columns)
 
-        # Parse data array, replace nodata, filter and sort
-        for cpt in root.iter(ns + "conePenetrationTest"):
-            for element in cpt.iter(ns + "values"):
-                # Load string data and parse as 2d array
-                sar = StringIO(element.text.replace(";", "\n"))
-                array_data = np.loadtxt(sar, delimiter=",", ndmin=2)
-
-                # Check shape of array
-                found_rows, found_columns = array_data.shape
-                if found_columns != len(self.bro_data.columns_string_list):
-                    logging.warning(
-                        "Data has the wrong size! {} columns instead of {}".format(
-                            found_columns, len(self.bro_data.columns_string_list)
-                        )
-                    )
-                    return
-
-                # Replace nodata constant with nan
-                # Create a DataFrame from array
-                # and sort by depth
-                array_data[array_data == nodata] = np.nan
-                df = pd.DataFrame(array_data, columns=self.bro_data.columns_string_list)
-                df = df[avail_columns]
-                df.sort_values(by=["penetrationLength"], inplace=True)
-
-            self.bro_data.dataframe = df
+        if values is None:
+            return
+
+        # Parse the string data directly into a DataFrame, rows are
+        # separated by ";" and nodata values are read as nan. Rows with
+        # missing values are padded with nan by pandas, so they are
+        # checked separately below
+        df = pd.read_csv(
+            StringIO(values.strip()),
+            sep=",",
+            lineterminator=";",
+            header=None,
+            dtype=np.float64,
+            na_values=[nodata],
+            engine="c",
+        )
+
+        # Check shape of array
+        columns = self.bro_data.columns_string_list
+        found_rows, found_columns = df.shape
+        if found_columns != len(columns):
+            logging.warning(
+                "Data has the wrong size! {} columns instead of {}".format(
+                    found_columns, len(columns)
+                )
+            )
+            return
+        # Every row should contain a value for each column
+        if values.count(",") != found_rows * (found_columns - 1):
+            raise ValueError("Data contains rows with a wrong number of values")
+
+        # Sort by depth and filter the available columns on the parsed array
+        column_positions = {column: index for index, column in enumerate(columns)}
+        array_data = df.to_numpy()
+        order = np.argsort(
+            array_data[:, column_positions["penetrationLength"]], kind="stable"
+        )
+        avail_index = [column_positions[column] for column in avail_columns]
+        self.bro_data.data = np.asfortranarray(array_data[np.ix_(order, avail_index)])
+        self.bro_data.column_index = {
+            column: index for index, column in enumerate(avail_columns)
+        }
 
     def all_single_data_available(self) -> bool:
         return None not in [
@@ -232,104 +324,115 @@ class XMLBroCPTReader(CptReader):
     def are_all_required_data_available(self, avail_columns: List) -> None:
         """Determine if all data is available"""
         meta_usable = self.all_single_data_available()
-        data_usable = all([col in avail_columns for col in req_columns])
+        data_usable = set(avail_columns).issuperset(req_columns)
         if not (meta_usable and data_usable):
             logging.warning(
                 "CPT with id {} misses required data.".format(self.bro_data.id)
             )
 
     @staticmethod
-    def parse_xml_location(tdata: bytes):
-        """Return x y of location.
-        TODO Don't user iter
-        :param tdata: XML bytes
-        :returns: list -- of x y string coordinates
+    def _extract_location(location: _Element) -> Tuple[float, float]:
+        """Return x y of the delivered location.
+        :param location: parsed deliveredLocation element
+        :returns: tuple -- of x y coordinates
 
         Will transform coordinates not in EPSG:28992
         """
-        root = etree.fromstring(tdata)
         crs = None
 
-        for loc in root.iter(ns2 + "deliveredLocation"):
-            for point in loc.iter(ns3 + "Point"):
-                srs = point.get("srsName")
-                if srs is not None and "EPSG" in srs:
-                    crs = srs.split("::")[-1]
-                break
-            for pos in loc.iter(ns3 + "pos"):
-                x, y = map(float, pos.text.split(" "))
-                break
+        srs = xpath_srs_name(location)
+        if "EPSG" in srs:
+            crs = srs.split("::")[-1]
+        x, y = map(float, xpath_pos(location).split(" "))
 
         if crs is not None and crs != to_epsg:
             logging.warning("Reprojecting from epsg::{}".format(crs))
-            transformer = pyproj.Transformer.from_crs(f"epsg:{crs}", f"epsg:{to_epsg}")
-            x, y = transformer.transform(x, y)
+            x, y = _get_transformer(crs).transform(x, y)
 
         return x, y
 
-    def get_all_data_from_bro(self, root: _Element) -> None:
-        """Extract values from bro. From the xml elements."""
-        # BRO Id
-        self.bro_data.id = self.search_values_in_root(
-            root=root, search_item=ns4 + "broId"
-        )
-        # Norm of the cpt
-        self.bro_data.cpt_standard = self.search_values_in_root(
-            root=root, search_item=ns2 + "cptStandard"
-        )
-        # Offset to reference point
-        z = self.search_values_in_root(root=root, search_item=ns + "offset")
-        self.bro_data.offset_z = float(z)
-        # Local reference point
-        self.bro_data.local_reference = self.search_values_in_root(
-            root=root, search_item=ns + "localVerticalReferencePoint"
-        )
-        # Vertical datum
-        self.bro_data.vertical_datum = self.search_values_in_root(
-            root=root, search_item=ns + "verticalDatum"
-        )
-        # cpt class
-        self.bro_data.quality_class = self.search_values_in_root(
-            root=root, search_item=ns + "qualityClass"
-        )
-        # cpt type and serial number
-        self.bro_data.cone_penetrometer_type = self.search_values_in_root(
-            root=root, search_item=ns + "conePenetrometerType"
-        )
-        # cpt time of result
-        for cpt in root.iter(ns + "conePenetrationTest"):
-            for loc in cpt.iter(ns5 + "resultTime"):
-                if loc.text.strip() == "":
-                    for loc2 in loc.iter(ns3 + "timePosition"):
-                        self.bro_data.result_time = loc2.text
+    def __parse_element(self, element: _Element) -> None:
+        """Extract the value of a single bro xml element."""
+        tag = element.tag
+        if tag == ns4 + "broId":
+            # BRO Id
+            self.bro_data.id = element.text
+        elif tag == ns2 + "cptStandard":
+            # Norm of the cpt
+            self.bro_data.cpt_standard = element.text
+        elif tag == ns + "offset":
+            # Offset to reference point
+            self.bro_data.offset_z = float(element.text)
+        elif tag == ns + "localVerticalReferencePoint":
+            # Local reference point
+            self.bro_data.local_reference = element.text
+        elif tag == ns + "verticalDatum":
+            # Vertical datum
+            self.bro_data.vertical_datum = element.text
+        elif tag == ns + "qualityClass":
+            # cpt class
+            self.bro_data.quality_class = element.text
+        elif tag == ns + "conePenetrometerType":
+            # cpt type and serial number
+            self.bro_data.cone_penetrometer_type = element.text
+        elif tag == ns + "predrilledDepth":
+            # Pre drilled depth
+            if element.text:
+                self.bro_data.predrilled_z = float(element.text)
+        elif tag == ns + "coneSurfaceQuotient":
+            # Cone coefficient - a
+            if element.text:
+                self.bro_data.a = float(element.text)
+        elif tag == ns2 + "deliveredLocation":
+            # Location
+            x, y = self._extract_location(element)
+            self.bro_data.location_x = float(x)
+            self.bro_data.location_y = float(y)
+        elif tag == ns + "conePenetrationTest":
+            # cpt time of result
+            for loc in xpath_result_time(element):
+                if (loc.text or "").strip() == "":
+                    for time_position in xpath_time_position(loc):
+                        self.bro_data.result_time = time_position
                 else:
                     self.bro_data.result_time = loc.text
 
-        # Pre drilled depth
-        z = self.search_values_in_root(root=root, search_item=ns + "predrilledDepth")
-        # if predrill does not exist it is zero
-        if not z:
-            z = 0.0
-        self.bro_data.predrilled_z = float(z)
-
-        # Cone coefficient - a
-        a = self.search_values_in_root(root=root, search_item=ns + "coneSurfaceQuotient")
-        if a:
-            self.bro_data.a = float(a)
-        return None
-
     def read_file(self, filepath: Path) -> dict:
-        # read the BRO_XML into Memory
-        xml = self.xml_to_byte_string(filepath)
+        # memory-map the BRO_XML
+        xml = self.xml_to_mmap(filepath)
 
         # parse the BRO_XML to BRO CPT Dataset
-        self.parse_bro_xml(xml)
+        try:
+            self.parse_bro_xml(xml)
+        finally:
+            xml.close()
 
         # add the BRO_XML attributes to CPT structure
         result_dictionary = self.__parse_bro_raw_data()
 
         return result_dictionary
 
+    @classmethod
+    def read_many(
+        cls,
+        filepaths: Iterable[Path],
+        max_workers: Optional[int] = None,
+        chunksize: int = 32,
+    ) -> List[dict]:
+        """
+        Reads multiple BRO_XML files in parallel processes, each file is read by a new
+        reader of this class.
+
+        :param filepaths: paths of the xml files
+        :param max_workers: number of processes, defaults to the number of processors
+        :param chunksize: number of files that are sent to a process at once
+        :return: list of the read data, in the order of the file paths
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(partial(_read_file, cls), filepaths, chunksize=chunksize)
+            )
+
     def __parse_bro_raw_data(self) -> Dict:
         result_dictionary = {
             "name": self.bro_data.id,
@@ -347,22 +450,22 @@ class XMLBroCPTReader(CptReader):
             "a": self.bro_data.a,
             "predrilled_z": self.bro_data.predrilled_z,
         }
+        available_columns = self.bro_data.column_index or {}
         result_dictionary["water_measurement_type"] = [
             water_measurement_type
             for water_measurement_type in self.__water_measurement_types
-            if water_measurement_type in self.bro_data.dataframe
+            if water_measurement_type in available_columns
         ]
 
-        # extract values from dataframe
-        if self.bro_data.dataframe is not None:
-            bro_dataframe = self.bro_data.dataframe
-            for key, value in self.bro_dataframe_map.items():
-                result_dictionary[key] = bro_dataframe.get(value, None)
-        return self.transform_dict_fields_to_arrays(dictionary=result_dictionary)
+        # extract values from data
+        if self.bro_data.data is not None:
+            result_dictionary.update(
+                (key, self.bro_data.get_column(value))
+                for key, value in self.bro_dataframe_map.items()
+            )
+        return result_dictionary
 
-    @staticmethod
-    def transform_dict_fields_to_arrays(dictionary: Dict) -> Dict:
-        for key, value in dictionary.items():
-            if isinstance(value, pd.Series):
-                dictionary[key] = value.values
-        return dictionary
+
+def _read_file(reader_class: Type[XMLBroCPTReader], filepath: Path) -> dict:
+    """Read a single BRO_XML file, used by the worker processes of read_many."""
+    return reader_class().read_file(filepath)
@@ -61,25 +61,35 @@ class BroXmlCpt(AbstractCPT):
             "water",
         ]
 
-    def remove_points_with_error(self):
+    def __get_array_values(self) -> dict:
         """
-        Updates fields by removing depths that contain nan values.
-        This means that all the properties in __list_of_array_values will be updated.
+        Returns the properties in __list_of_array_values that are not None.
         """
-        # transform to dataframe
         update_dict = {}
         for value in self.__list_of_array_values:
             # ignore None values
             if getattr(self, value) is not None:
                 update_dict[value] = getattr(self, value)
-        # perform action
-        update_dict = pd.DataFrame(update_dict).dropna().to_dict("list")
+        return update_dict
+
+    def __keep_samples(self, update_dict: dict, is_kept: np.ndarray):
+        """
+        Updates the properties in update_dict, only the samples where is_kept is True remain.
+        """
+        for value, update_with_value in update_dict.items():
+            setattr(self, value, np.asarray(update_with_value)[is_kept])
+
+    def remove_points_with_error(self):
+        """
+        Updates fields by removing depths that contain nan values.
+        This means that all the properties in __list_of_array_values will be updated.
+        """
+        # collect the array values
+        update_dict = self.__get_array_values()
+        # perform action: a depth is removed if any of the properties is nan
+        is_valid = ~pd.DataFrame(update_dict).isna().any(axis=1).to_numpy()
         # update changed values in cpt
-        for value in self.__list_of_array_values:
-            update_with_value = update_dict.get(value, None)
-            # None values should be skipped
-            if update_with_value is not None:
-                setattr(self, value, np.array(update_with_value))
+        self.__keep_samples(update_dict, is_valid)
         return
 
     def has_points_with_error(self) -> bool:
@@ -107,22 +117,14 @@ class BroXmlCpt(AbstractCPT):
         This means that all the properties in __list_of_array_values will be updated.
         """
         # TODO maybe here it makes more sense for the user to define what should not be duplicate
-        # transform to dataframe
-        update_dict = {}
-        for value in self.__list_of_array_values:
-            # ignore None values
-            if getattr(self, value) is not None:
-                update_dict[value] = getattr(self, value)
-        # perform action
-        update_dict = (
-            pd.DataFrame(update_dict)
-            .drop_duplicates(subset="penetration_length", keep="first")
-            .to_dict("list")
-        )
+        if self.penetration_length is None:
+            return
+        update_dict = self.__get_array_values()
+        # perform action: only the first sample of each penetration length is kept
+        penetration_length = np.asarray(self.penetration_length)
+        _, first_index = np.unique(penetration_length, return_index=True)
+        is_first = np.zeros(len(penetration_length), dtype=bool)
+        is_first[first_index] = True
         # update changed values in cpt
-        for value in self.__list_of_array_values:
-            update_with_value = update_dict.get(value, None)
-            # None values should be skipped
-            if update_with_value is not None:
-                setattr(self, value, np.array(update_with_value))
+        self.__keep_samples(update_dict, is_first)
         return
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import numpy as np
@@ -7,6 +8,9 @@ from lxml import etree
 
 from geolib_plus.cpt_base_model import AbstractCPT
 
+# Parser shared by all validated bro xml files
+bro_parser = etree.XMLParser(huge_tree=True, resolve_entities=False)
+
 
 class HTTPSResolver(etree.Resolver):
     __name__ = "HTTPSResolver"
@@ -39,14 +43,20 @@ class HTTPSResolver(etree.Resolver):
             return self.resolve_filename(url, context)
 
 
-def validate_bro(schema_url, bro_xml_file):
-    bro_tree = etree.parse(bro_xml_file).find(
-        "{http://www.broservices.nl/xsd/dscpt/1.1}dispatchDocument"
-    )[0]
+@lru_cache(maxsize=None)
+def _get_xml_schema(schema_url):
+    """Compile the xml schema once per schema url."""
     parser = etree.XMLParser(load_dtd=True)
     resolver = HTTPSResolver(schema_url)
     parser.resolvers.add(resolver)
-    xml_validator = etree.XMLSchema(etree.parse(schema_url, parser=parser))
+    return etree.XMLSchema(etree.parse(schema_url, parser=parser))
+
+
+def validate_bro(schema_url, bro_xml_file):
+    bro_tree = etree.parse(bro_xml_file, parser=bro_parser).find(
+        "{http://www.broservices.nl/xsd/dscpt/1.1}dispatchDocument"
+    )[0]
+    xml_validator = _get_xml_schema(schema_url)
 
     if xml_validator.validate(bro_tree):
         return 0
@@ -70,17 +80,19 @@ class ValidatePreProcessing:
             "penetration_length",
             "tip",
             "friction",
-            "friction_ratio",
+            "friction_nbr",
         ]
-        for k in keys:
-            if all(np.array(getattr(cpt, k)) == 0) or all(
-                np.array(getattr(cpt, k)) is None
-            ):
-                logging.warning("File " + cpt.name + " contains empty data")
-                return
+        data = [getattr(cpt, k) for k in keys]
+        # the data is empty if any of the properties is missing or only contains zeros
+        if any(values is None or not np.any(values) for values in data):
+            logging.warning("File " + cpt.name + " contains empty data")
+            return
 
     def __check_criteria_minimum_length(self, cpt, minimum_length: int):
-        if np.max(np.abs(cpt.penetration_length)) < minimum_length:
+        penetration_length = np.asarray(cpt.penetration_length)
+        # maximum absolute value, without allocating an absolute value array
+        max_length = max(penetration_length.max(), -penetration_length.min())
+        if max_length < minimum_length:
             logging.warning(
                 "File " + cpt.name + " has a length smaller than " + str(minimum_length)
             )
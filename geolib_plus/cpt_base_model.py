@@ -1,11 +1,10 @@
 import math
 from abc import abstractmethod
-from copy import deepcopy
 from pathlib import Path
 from typing import Iterable, List, Optional, Type
 
 import numpy as np
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .plot_cpt import plot_cpt_norm
 from .plot_settings import PlotSettings
@@ -104,7 +103,7 @@ class AbstractCPT(BaseModel):
     fr_angle_NEN: Optional[Iterable]
 
     # plot settings
-    plot_settings: PlotSettings = PlotSettings()
+    plot_settings: PlotSettings = Field(default_factory=PlotSettings)
 
     # fixed values
     g: float = 9.81  # gravitational constant [m/s2]
@@ -263,16 +262,23 @@ class AbstractCPT(BaseModel):
         :param inclination: measured inclination of the cone
         :return: corrected depth
         """
-        corrected_d_depth = np.diff(self.penetration_length) * np.cos(
-            np.radians(np.nan_to_num(self.inclination_resultant[:-1], nan=0.0))
-        )
-        corrected_depth = np.concatenate(
-            (
-                self.penetration_length[0],
-                self.penetration_length[0] + np.cumsum(corrected_d_depth),
-            ),
-            axis=None,
+        penetration_length = np.asarray(self.penetration_length, dtype=np.float64)
+        # the correction factor is computed in place on a single copy of the inclination
+        # in degrees, which is converted to radians, then to its cosine and finally to
+        # the corrected depth increments
+        factor = np.nan_to_num(
+            np.array(self.inclination_resultant[:-1], dtype=np.float64),
+            copy=False,
+            nan=0.0,
         )
+        np.radians(factor, out=factor)
+        np.cos(factor, out=factor)
+        corrected_d_depth = np.multiply(np.diff(penetration_length), factor, out=factor)
+        # the cumulative sum is written directly into the output array
+        corrected_depth = np.empty(len(penetration_length))
+        corrected_depth[0] = penetration_length[0]
+        np.cumsum(corrected_d_depth, out=corrected_depth[1:])
+        corrected_depth[1:] += penetration_length[0]
         return corrected_depth
 
     def calculate_depth(self):
@@ -284,13 +290,17 @@ class AbstractCPT(BaseModel):
         :return:
         """
 
-        if self.depth is not None:
+        if (
+            self.depth is not None
+            and np.size(self.depth) != 0
+            and np.isfinite(self.depth).all()
+        ):
             # no calculations needed
             return
         if self.inclination_resultant is not None:
             self.depth = self.__calculate_corrected_depth()
         else:
-            self.depth = deepcopy(self.penetration_length)
+            self.depth = np.array(self.penetration_length)
 
     @staticmethod
     def __correct_for_negatives(data: np.ndarray) -> np.ndarray:
@@ -298,10 +308,12 @@ class AbstractCPT(BaseModel):
         Values tip / friction / friction cannot be negative so they
         have to be zero.
         """
-        if data is not None:
-            if data.size != 0 and not data.ndim:
-                data[data < 0] = 0
-            return data
+        if data is None:
+            return None
+        data = np.asarray(data)
+        # negative values are set to zero in place
+        np.maximum(data, 0, out=data)
+        return data
 
     def __get_water_data(self):
 
@@ -315,8 +327,8 @@ class AbstractCPT(BaseModel):
 
         for data in pore_pressure_data:
             if data is not None:
-                if data.size and data.ndim and not np.all(data == 0):
-                    self.water = deepcopy(data)
+                if data.size and data.ndim and np.any(data):
+                    self.water = data.copy()
                     break
 
         if self.water is None:
@@ -346,12 +358,44 @@ class AbstractCPT(BaseModel):
         Appends average value defined from length_of_average_points from missing
         inputs defined from the size of the local depth input.
         """
-        # calculate the average along the depth for this value
-        average = np.average(values[:length_of_average_points])
-        # the pre-drill part consists of repeated values of this kind
-        local_values = np.repeat(average, len(local_depth))
-        # new values are appended to the result
-        return np.append(local_values, values)
+        return AbstractCPT.__update_values_with_pre_drill(
+            local_depth=local_depth,
+            values=np.asarray(values, dtype=np.float64)[np.newaxis],
+            length_of_average_points=length_of_average_points,
+        )[0]
+
+    @staticmethod
+    def __update_values_with_pre_drill(
+        local_depth: Iterable, values: np.ndarray, length_of_average_points: int
+    ) -> np.ndarray:
+        """
+        Appends the pre-drill values to a 2D array where each row contains the values
+        of one property, all rows have the same length. The result is filled in a
+        single allocation.
+        """
+        n_local = len(local_depth)
+        updated_values = np.empty((values.shape[0], n_local + values.shape[1]))
+        # the pre-drill part consists of the average of the first values of each row
+        updated_values[:, :n_local] = np.average(
+            values[:, :length_of_average_points], axis=1
+        )[:, np.newaxis]
+        updated_values[:, n_local:] = values
+        return updated_values
+
+    def __get_values_as_rows(self, value_names: List[str]) -> np.ndarray:
+        """
+        Gets the values of the given properties as a 2D array, one row per property.
+        All the properties should have the same number of samples.
+        """
+        values = [getattr(self, value_name) for value_name in value_names]
+        lengths = {
+            value_name: len(value) for value_name, value in zip(value_names, values)
+        }
+        if len(set(lengths.values())) > 1:
+            raise ValueError(
+                f"The properties should have the same number of samples, got {lengths}."
+            )
+        return np.array(values, dtype=np.float64)
 
     def __correct_missing_samples_top_CPT(self, length_of_average_points: int):
         """
@@ -360,21 +404,25 @@ class AbstractCPT(BaseModel):
         for length length_of_average_points.
         """
         # add zero
-        self.depth = np.append(0, self.depth)
-        self.penetration_length = np.append(0, self.penetration_length)
+        self.depth = np.concatenate((0, self.depth), axis=None)
+        self.penetration_length = np.concatenate((0, self.penetration_length), axis=None)
+        value_names = []
         for value_name in self.__list_of_array_values:
+            if value_name in ("depth", "penetration_length"):
+                continue
             data = getattr(self, value_name)
-            if (
-                (data is not None)
-                and (value_name != "depth")
-                and (value_name != "penetration_length")
-            ):
+            if data is not None:
                 if not (all(v is None for v in data)):
-                    value_to_add = np.append(
-                        np.average(data[:length_of_average_points]),
-                        data,
-                    )
-                    setattr(self, value_name, value_to_add)
+                    value_names.append(value_name)
+        # the averages of all the values are computed at once, one row per value
+        if value_names:
+            updated_values = self.__update_values_with_pre_drill(
+                local_depth=[0],
+                values=self.__get_values_as_rows(value_names),
+                length_of_average_points=length_of_average_points,
+            )
+            for value_name, updated_value in zip(value_names, updated_values):
+                setattr(self, value_name, updated_value)
         return
 
     def perform_pre_drill_interpretation(self, length_of_average_points: int = 3):
@@ -403,29 +451,32 @@ class AbstractCPT(BaseModel):
             local_depth = np.arange(
                 starting_depth, float(self.undefined_depth), discretization
             )
+            value_names = []
             for value_name in self.__list_of_array_values:
-                # depth value and Nones should be skipped
-                if (getattr(self, value_name) is not None) and (
-                    value_name
-                    not in [
-                        "penetration_length",
-                        "depth",
-                        "pore_pressure_u1",
-                        "pore_pressure_u2",
-                        "pore_pressure_u3",
-                        "water",
-                    ]
+                # depth value and water values are updated separately
+                if value_name in (
+                    "penetration_length",
+                    "depth",
+                    "pore_pressure_u1",
+                    "pore_pressure_u2",
+                    "pore_pressure_u3",
+                    "water",
                 ):
-                    if not (all(v is None for v in getattr(self, value_name))):
-                        setattr(
-                            self,
-                            value_name,
-                            self.update_value_with_pre_drill(
-                                local_depth=local_depth,
-                                values=getattr(self, value_name),
-                                length_of_average_points=length_of_average_points,
-                            ),
-                        )
+                    continue
+                values = getattr(self, value_name)
+                # Nones should be skipped
+                if values is not None:
+                    if not (all(v is None for v in values)):
+                        value_names.append(value_name)
+            # all the values are updated at once, one row per value
+            if value_names:
+                updated_values = self.__update_values_with_pre_drill(
+                    local_depth=local_depth,
+                    values=self.__get_values_as_rows(value_names),
+                    length_of_average_points=length_of_average_points,
+                )
+                for value_name, updated_value in zip(value_names, updated_values):
+                    setattr(self, value_name, updated_value)
             # if there is pore water pressure
             # Here the endpoint is False so that for the final of
             # local_pore_pressure I don't end up with the same value
@@ -443,22 +494,28 @@ class AbstractCPT(BaseModel):
                         setattr(
                             self,
                             water_measurement_type,
-                            np.append(
-                                local_pore_pressure,
-                                pore_pressure_type,
+                            np.concatenate(
+                                (local_pore_pressure, pore_pressure_type),
+                                axis=None,
                             ),
                         )
             # Enrich the depth
-            self.depth = np.append(
-                local_depth,
-                local_depth[-1] + discretization + self.depth - self.depth[0],
+            self.depth = np.concatenate(
+                (
+                    local_depth,
+                    local_depth[-1] + discretization + self.depth - self.depth[0],
+                ),
+                axis=None,
             )
-            self.penetration_length = np.append(
-                local_depth,
-                local_depth[-1]
-                + discretization
-                + self.penetration_length
-                - self.penetration_length[0],
+            self.penetration_length = np.concatenate(
+                (
+                    local_depth,
+                    local_depth[-1]
+                    + discretization
+                    + self.penetration_length
+                    - self.penetration_length[0],
+                ),
+                axis=None,
             )
         # correct for missing samples in the top of the CPT
         if self.depth[0] - 1e-9 > 0:
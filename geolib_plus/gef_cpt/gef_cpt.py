@@ -19,7 +19,7 @@ class GefCpt(AbstractCPT):
         """
         Updates fields by removing depths that contain values with errors. i.e. incomplete data
         """
-        # transform to dataframe
+        # collect the values that have an error code
         update_dict = {}
         altered_keys = []
         for key in self.error_codes.keys():
@@ -38,20 +38,19 @@ class GefCpt(AbstractCPT):
                     )
                 update_dict[key] = current_attribute
 
-        update_dict = DataFrame.from_dict(update_dict)
+        if not altered_keys:
+            return
 
-        # remove points with error codes
-        for key in self.error_codes.keys():
-            if key in altered_keys:
-                update_dict = update_dict[update_dict[key] != self.error_codes[key]]
-                # update error key to a consistend value for interpretation
-                self.error_codes[key] = numpy.nan
-
-        update_dict.to_dict("list")
+        # a point is removed if any of its values has an error code
+        is_valid = numpy.ones(len(update_dict[altered_keys[0]]), dtype=bool)
+        for key in altered_keys:
+            is_valid &= update_dict[key] != self.error_codes[key]
+            # update error key to a consistend value for interpretation
+            self.error_codes[key] = numpy.nan
 
         # update changed values in cpt
         for value in altered_keys:
-            setattr(self, value, array(update_dict.get(value)))
+            setattr(self, value, array(update_dict[value])[is_valid])
 
     def has_points_with_error(self) -> bool:
         """
@@ -12,6 +12,9 @@ from geolib_plus.cpt_base_model import CptReader
 
 from .validate_gef import validate_gef_cpt
 
+# separators of the values in the data rows of a gef file
+data_separators = re.compile("[ :,!\t]+")
+
 
 class GefProperty(BaseModel):
     gef_key: int
@@ -210,7 +213,7 @@ class GefFileReader(CptReader):
         self.match_idx_with_error(idx_errors_raw_text)
         # rewrite data with separator ;
         data[idx_EOH + 1 :] = [
-            re.sub("[ :,!\t]+", ";", i.lstrip()) for i in data[idx_EOH + 1 :]
+            data_separators.sub(";", i.lstrip()) for i in data[idx_EOH + 1 :]
         ]
 
         # search line with coefficient a
@@ -338,12 +341,12 @@ class GefFileReader(CptReader):
 
     def get_as_np_array(self, values_from_gef: Iterable):
         """
-        Converts iterable to np array if the values are not None
+        Converts iterable to a float64 np array if the values are not None
         :param values_from_gef:
         :return: numpy array
         """
         if values_from_gef is not None:
-            return np.array(values_from_gef)
+            return np.array(values_from_gef, dtype=np.float64)
         else:
             return None
 
@@ -1,10 +1,45 @@
 # import packages
+from functools import lru_cache
+from typing import Iterable, Tuple
 
 import numpy as np
 from pydantic import BaseModel
 from scipy.stats import norm, t
 
 
+@lru_cache(maxsize=1024)
+def _student_t_factor(ndof: int, quantile: float) -> float:
+    """
+    Gets the student t factor, the result is cached per number of degrees of freedom and quantile.
+    """
+    return float(t.ppf(quantile, ndof))
+
+
+@lru_cache(maxsize=128)
+def _normal_factor(quantile: float) -> float:
+    """
+    Gets the value of the standard normal distribution, the result is cached per quantile.
+    """
+    return float(norm.ppf(quantile))
+
+
+def _get_characteristic_quantile_and_spread_reduction(
+    is_local: bool, is_low: bool, char_quantile: float
+) -> Tuple[float, float]:
+    """
+    Gets the quantile of the low or high characteristic value and the spread reduction factor; 0.75 if data
+    collection is regional, 1.0 if data collection is local.
+    """
+    if char_quantile > 0.5 and is_low:
+        char_quantile = 1 - char_quantile
+    elif char_quantile < 0.5 and not is_low:
+        char_quantile = 1 - char_quantile
+
+    a = 1 if is_local else 0.75
+
+    return char_quantile, a
+
+
 class ProbUtils(BaseModel):
     """
     Class contains probabilistic utilities for parameter determination following the methodology as described in
@@ -24,7 +59,10 @@ class ProbUtils(BaseModel):
         :return: Student t factor
         """
 
-        return t(ndof).ppf(quantile)
+        # only scalar input is cached, arrays are calculated directly
+        if np.isscalar(ndof) and np.isscalar(quantile):
+            return _student_t_factor(ndof, quantile)
+        return t.ppf(quantile, ndof)
 
     @staticmethod
     def correct_std_with_student_t(
@@ -59,7 +97,10 @@ class ProbUtils(BaseModel):
         t_factor = ProbUtils.calculate_student_t_factor(ndof - 1, quantile)
 
         # get value at percentile for normal distribution
-        norm_factor = norm.ppf(quantile)
+        if np.isscalar(quantile):
+            norm_factor = _normal_factor(quantile)
+        else:
+            norm_factor = norm.ppf(quantile)
 
         # calculate corrected standard deviation
         corrected_std = t_factor / norm_factor * std * np.sqrt((1 - a) + (1 / ndof))
@@ -138,10 +179,10 @@ class ProbUtils(BaseModel):
         :param data: dataset, X
         :return: mean and std of LN(X)
         """
-        log_mean = np.sum(np.log(data)) / len(data)
-        log_std = np.sqrt(np.sum((np.log(data) - log_mean) ** 2) / (len(data) - 1))
-
-        return log_mean, log_std
+        # LN(X) is only calculated once
+        return ProbUtils.calculate_normal_stats(
+            np.log(np.asarray(data, dtype=np.float64))
+        )
 
     @staticmethod
     def calculate_normal_stats(data: np.ndarray):
@@ -151,8 +192,9 @@ class ProbUtils(BaseModel):
         :param data: dataset, X
         :return: mean and std of X
         """
-        mean = np.sum(data) / len(data)
-        std = np.sqrt(np.sum((data - mean) ** 2) / (len(data) - 1))
+        data = np.asarray(data, dtype=np.float64)
+        mean = data.mean()
+        std = data.std(ddof=1)
 
         return mean, std
 
@@ -221,16 +263,9 @@ class ProbUtils(BaseModel):
 
         # direction_factor = -1 if is_low else 1
 
-        if char_quantile > 0.5 and is_low:
-            char_quantile = 1 - char_quantile
-        elif char_quantile < 0.5 and not is_low:
-            char_quantile = 1 - char_quantile
-
-        # set spread reduction factor, 0.75 if data collection is regional, 1.0 if data collection is local
-        if is_local:
-            a = 1
-        else:
-            a = 0.75
+        char_quantile, a = _get_characteristic_quantile_and_spread_reduction(
+            is_local, is_low, char_quantile
+        )
 
         if is_log_normal:
             # calculate characteristic value from log normal distribution
@@ -254,6 +289,64 @@ class ProbUtils(BaseModel):
 
         return x_kar
 
+    @staticmethod
+    def calculate_characteristic_values_from_datasets(
+        datasets: Iterable[np.ndarray],
+        is_local: bool,
+        is_low: bool,
+        is_log_normal: bool = True,
+        char_quantile: float = 0.05,
+    ) -> np.ndarray:
+        r"""
+        Calculates the characteristic value of multiple datasets at once. The datasets can be given as a 2D array,
+        where each row is a dataset, or as a list of 1D arrays of different lengths. The characteristic value of each
+        dataset is calculated as in :meth:`calculate_characteristic_value_from_dataset`, the student t factor is only
+        calculated once for each unique dataset length.
+
+        :param datasets: datasets, X
+        :param is_local: true if data collection is local, false if data collection is regional
+        :param is_low: true if low characteristic value is to be calculated, false if high characteristic value desired
+        :param is_log_normal: True if a log normal distribution is assumed, false for normal distribution
+        :param char_quantile: Quantile which is considered for the characteristic value
+
+        :return: characteristic values of the datasets
+        :raises ValueError: if no datasets are given or a dataset contains less than two values
+        """
+
+        char_quantile, a = _get_characteristic_quantile_and_spread_reduction(
+            is_local, is_low, char_quantile
+        )
+
+        # all datasets are concatenated, such that the statistics are calculated in one pass
+        datasets = [np.asarray(data, dtype=np.float64).ravel() for data in datasets]
+        n = np.array([len(data) for data in datasets])
+        if n.size == 0:
+            raise ValueError("At least one dataset is required.")
+        if np.any(n < 2):
+            raise ValueError("Each dataset should contain at least two values.")
+        starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+        values = np.concatenate(datasets)
+        if is_log_normal:
+            values = np.log(values)
+
+        # calculate mean and std per dataset
+        mean = np.add.reduceat(values, starts) / n
+        deviation = values - np.repeat(mean, n)
+        std = np.sqrt(np.add.reduceat(deviation**2, starts) / (n - 1))
+
+        # get student t factor per unique dataset length
+        unique_n, inverse = np.unique(n, return_inverse=True)
+        t_factors = np.array(
+            [_student_t_factor(int(n_data) - 1, char_quantile) for n_data in unique_n]
+        )[inverse]
+
+        # calculate characteristic values
+        x_kar = mean + t_factors * std * np.sqrt((1 - a) + (1 / n))
+        if is_log_normal:
+            x_kar = np.exp(x_kar)
+
+        return x_kar
+
     @staticmethod
     def calculate_std_from_vc(mean: float, vc: float):
         """
@@ -14,6 +14,15 @@ from geolib_plus.bro_xml_cpt.bro_utils import XMLBroCPTReader
 from tests.utils import TestUtils
 
 
+class NamedXMLBroCPTReader(XMLBroCPTReader):
+    """Reader that adds the name of its class to the read data."""
+
+    def read_file(self, filepath: Path) -> dict:
+        result_dictionary = super().read_file(filepath)
+        result_dictionary["reader"] = type(self).__name__
+        return result_dictionary
+
+
 # todo JN: write unit tests
 class TestBroUtil:
     @pytest.mark.unittest
@@ -51,7 +60,21 @@ class TestBroUtil:
         assert test_columns == columns
 
     @pytest.mark.unittest
-    def test_xml_to_byte_string(self):
+    def test_bro_data_is_not_shared(self):
+        # initialise models
+        first_reader = bro.XMLBroCPTReader()
+        second_reader = bro.XMLBroCPTReader()
+        # run test
+        first_reader.bro_data.id = "CPT 1"
+        # check results
+        assert first_reader.bro_data is not second_reader.bro_data
+        assert second_reader.bro_data.id is None
+        assert first_reader.water_measurement_type is not (
+            second_reader.water_measurement_type
+        )
+
+    @pytest.mark.unittest
+    def test_xml_to_mmap(self):
         # define input path to xml
         test_file = TestUtils.get_local_test_data_dir(
             Path("cpt", "bro_xml", "CPT000000003688_IMBRO_A.xml")
@@ -59,43 +82,20 @@ class TestBroUtil:
         # test initial expectations
         assert test_file.is_file()
         # run test
-        model = bro.XMLBroCPTReader.xml_to_byte_string(fn=test_file)
-        # test results
-        assert model
+        model = bro.XMLBroCPTReader.xml_to_mmap(fn=test_file)
+        try:
+            # test results
+            assert model
+        finally:
+            model.close()
 
     @pytest.mark.unittest
-    def test_xml_to_byte_string_wrong_path(self):
+    def test_xml_to_mmap_wrong_path(self):
         # define input path to xml
         test_file = TestUtils.get_local_test_data_dir(Path("cpt", "bro_xml", "wrong.xml"))
         # final test
         with pytest.raises(FileNotFoundError):
-            bro.XMLBroCPTReader.xml_to_byte_string(fn=test_file)
-
-    @pytest.mark.unittest
-    def test_search_values_in_root(self):
-        root = etree.Element("parentofall")
-        root.text = "leads to"
-
-        bold = etree.SubElement(root, "childofall")
-        bold.text = "here it is"
-        # initialise model
-        model = bro.XMLBroCPTReader()
-        # run test
-        result = model.search_values_in_root(root=root, search_item="childofall")
-        assert result == "here it is"
-
-    @pytest.mark.unittest
-    def test_search_values_in_root_does_not_exist(self):
-        root = etree.Element("parentofall")
-        root.text = "leads to"
-
-        bold = etree.SubElement(root, "childofall")
-        bold.text = "here it is"
-        # initialise model
-        model = bro.XMLBroCPTReader()
-        # run test
-        result = model.search_values_in_root(root=root, search_item="childofwrong")
-        assert not (result)
+            bro.XMLBroCPTReader.xml_to_mmap(fn=test_file)
 
     @pytest.mark.unittest
     def test_find_availed_data_columns(self):
@@ -119,6 +119,43 @@ class TestBroUtil:
         # check results
         assert len(result_list) == 2
 
+    @pytest.mark.unittest
+    def test_extract_location(self):
+        # set inputs
+        location = etree.Element(
+            "{http://www.broservices.nl/xsd/dscpt/1.1}" + "deliveredLocation"
+        )
+        child = etree.SubElement(
+            location, "{http://www.broservices.nl/xsd/cptcommon/1.1}" + "location"
+        )
+        pos = etree.SubElement(child, "{http://www.opengis.net/gml/3.2}" + "pos")
+        pos.text = "108992.7 433396.3"
+        # run test
+        x, y = bro.XMLBroCPTReader._extract_location(location)
+        # check results
+        assert x == 108992.7
+        assert y == 433396.3
+
+    @pytest.mark.unittest
+    def test_extract_location_reprojects(self):
+        # set inputs
+        location = etree.Element(
+            "{http://www.broservices.nl/xsd/dscpt/1.1}" + "deliveredLocation"
+        )
+        point = etree.SubElement(
+            location,
+            "{http://www.opengis.net/gml/3.2}" + "Point",
+            srsName="urn:ogc:def:crs:EPSG::4258",
+        )
+        pos = etree.SubElement(point, "{http://www.opengis.net/gml/3.2}" + "pos")
+        pos.text = "52.155172 5.387203"
+        # run test
+        x, y = bro.XMLBroCPTReader._extract_location(location)
+        # check results
+        assert x == pytest.approx(155000, abs=1)
+        assert y == pytest.approx(463000, abs=1)
+        assert bro._get_transformer("4258") is bro._get_transformer("4258")
+
     @pytest.mark.systemtest
     def test_parse_bro_xml(self):
         # open xml file as byte object
@@ -141,6 +178,43 @@ class TestBroUtil:
         assert cpt_data.bro_data.location_x == 108992.7
         assert cpt_data.bro_data.location_y == 433396.3
 
+    @pytest.mark.systemtest
+    def test_parse_bro_xml_replaces_nodata(self):
+        # open xml file as byte object
+        fn = TestUtils.get_local_test_data_dir(
+            Path("cpt", "bro_xml", "CPT000000065880_IMBRO_A.xml")
+        )
+        # test initial expectations
+        assert fn.is_file()
+        # initialise model
+        cpt_data = XMLBroCPTReader()
+        # run test
+        cpt_data.parse_bro_xml(xml=fn.read_bytes())
+        # nodata values are read as nan
+        data = cpt_data.bro_data.dataframe.to_numpy()
+        assert not np.any(data == bro.nodata)
+        assert cpt_data.bro_data.dataframe["localFriction"].isna().sum() == 10
+        assert cpt_data.bro_data.dataframe["porePressureU1"].isna().sum() == 2
+
+    @pytest.mark.systemtest
+    def test_parse_bro_xml_raises_on_missing_values(self):
+        # open xml file as byte object
+        fn = TestUtils.get_local_test_data_dir(
+            Path("cpt", "bro_xml", "CPT000000065880_IMBRO_A.xml")
+        )
+        # test initial expectations
+        assert fn.is_file()
+        # remove a value from the second row of the data
+        xml_bytes = fn.read_bytes().replace(
+            b";28.260,28.170,1911.2,", b";28.260,28.170,", 1
+        )
+        # initialise model
+        cpt_data = XMLBroCPTReader()
+        # run test
+        with pytest.raises(ValueError) as excinfo:
+            cpt_data.parse_bro_xml(xml=xml_bytes)
+        assert "Data contains rows with a wrong number of values" == str(excinfo.value)
+
     @pytest.mark.systemtest
     def test_parse_bro_xml_warning(self, caplog):
         # xml will still be read but a warning will be logged
@@ -177,7 +251,7 @@ class TestBroUtil:
         assert warning in caplog.text
 
     @pytest.mark.systemtest
-    def test_get_all_data_from_bro(self):
+    def test_parse_bro_xml_metadata(self):
         # open xml file as byte object
         fn = TestUtils.get_local_test_data_dir(
             Path(
@@ -192,14 +266,12 @@ class TestBroUtil:
         with open(fn, "r") as f:
             # memory-map the file, size 0 means whole file
             xml = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)[:]
-        # read test xml
-        root = etree.fromstring(xml)
         # initialise model
         cpt_data = XMLBroCPTReader()
         # test initial expectations
         assert cpt_data
         # run test
-        cpt_data.get_all_data_from_bro(root=root)
+        cpt_data.parse_bro_xml(xml=xml)
         # test that the data are read
         assert cpt_data.bro_data
         assert cpt_data.bro_data.a == 0.58  # <ns14:frictionSleeveSurfaceArea
@@ -212,3 +284,37 @@ class TestBroUtil:
         assert cpt_data.bro_data.quality_class == "klasse2"
         assert cpt_data.bro_data.result_time == "2011-06-29"
         assert cpt_data.bro_data.predrilled_z == 0.01
+
+    @pytest.mark.systemtest
+    def test_read_many(self):
+        # define input paths to xml
+        test_files = [
+            TestUtils.get_local_test_data_dir(Path("cpt", "bro_xml", file_name))
+            for file_name in [
+                "CPT000000003688_IMBRO_A.xml",
+                "CPT000000065880_IMBRO_A.xml",
+                "cpt_with_water.xml",
+            ]
+        ]
+        # run test
+        results = XMLBroCPTReader.read_many(test_files, max_workers=2, chunksize=1)
+        # results are in the order of the files and equal to a single read
+        assert len(results) == len(test_files)
+        for test_file, result in zip(test_files, results):
+            expected = XMLBroCPTReader().read_file(test_file)
+            assert result["name"] == expected["name"]
+            assert result["coordinates"] == expected["coordinates"]
+            np.testing.assert_array_equal(
+                result["penetration_length"], expected["penetration_length"]
+            )
+
+    @pytest.mark.systemtest
+    def test_read_many_uses_reader_class(self):
+        # define input path to xml
+        test_file = TestUtils.get_local_test_data_dir(
+            Path("cpt", "bro_xml", "CPT000000003688_IMBRO_A.xml")
+        )
+        # run test
+        results = NamedXMLBroCPTReader.read_many([test_file], max_workers=1)
+        # the files are read by the subclass
+        assert results[0]["reader"] == "NamedXMLBroCPTReader"
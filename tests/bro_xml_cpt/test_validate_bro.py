@@ -50,6 +50,22 @@ class TestValidateBro:
         # test
         assert "File CPT 1 contains empty data" in caplog.text
 
+    @pytest.mark.systemtest
+    def test_check_data_different_than_zero_no_message(self, caplog):
+        cpt_data = BroXmlCpt()
+        # define inputs
+        cpt_data.name = "CPT 1"
+        cpt_data.penetration_length = [0, 1, 2]
+        cpt_data.tip = [0, 4, 5]
+        cpt_data.friction_nbr = [6, 7, 8]
+        cpt_data.friction = [9, 10, 11]
+        # run test
+        ValidatePreProcessing()._ValidatePreProcessing__check_data_different_than_zero(
+            cpt=cpt_data
+        )
+        # test
+        assert "contains empty data" not in caplog.text
+
     @pytest.mark.systemtest
     def test_check_criteria_minimum_length(self, caplog):
         # xml will still be read but a warning will be logged
@@ -169,10 +169,10 @@ class TestRemovePointsWithError:
 
         # initialise the model
         gef_cpt.remove_points_with_error()
-        assert (gef_cpt.friction == np.array([-2, -3, -4])).all()
-        assert (gef_cpt.depth == np.array([1.6, 9.4, 12.0])).all()
-        assert (gef_cpt.friction_nbr == np.full(3, 5)).all()
-        assert (gef_cpt.pore_pressure_u2 == np.full(3, 1000)).all()
+        assert np.array_equal(gef_cpt.friction, [-2, -3, -4])
+        assert np.array_equal(gef_cpt.depth, [1.6, 9.4, 12.0])
+        assert np.array_equal(gef_cpt.friction_nbr, [5, 5, 5])
+        assert np.array_equal(gef_cpt.pore_pressure_u2, [1000, 1000, 1000])
 
     @pytest.mark.unittest
     def test_remove_points_with_error_raises(self):
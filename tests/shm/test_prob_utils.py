@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from geolib_plus.shm import prob_utils
 from geolib_plus.shm.prob_utils import ProbUtils
 
 
@@ -24,6 +25,34 @@ class TestProbUtils:
         # assert
         np.testing.assert_almost_equal(expected_value, calculated_value, 3)
 
+    @pytest.mark.unittest
+    def test_calculate_student_t_factor_is_cached(self):
+        """
+        tests that the student t factor is only calculated once per ndof and quantile
+        """
+
+        prob_utils._student_t_factor.cache_clear()
+
+        # calculate
+        first_value = ProbUtils.calculate_student_t_factor(20, 0.05)
+        second_value = ProbUtils.calculate_student_t_factor(20, 0.05)
+
+        # assert
+        assert first_value == second_value
+        assert prob_utils._student_t_factor.cache_info().hits == 1
+
+    @pytest.mark.unittest
+    def test_calculate_student_t_factor_array(self):
+        """
+        tests calculate student t factor for multiple numbers of degrees of freedom at once
+        """
+
+        # calculate
+        calculated_values = ProbUtils.calculate_student_t_factor(np.array([5, 10]), 0.05)
+
+        # assert
+        np.testing.assert_almost_equal([-2.015, -1.812], calculated_values, 3)
+
     @pytest.mark.unittest
     def test_correct_std_with_student_t(self):
         """
@@ -169,6 +198,62 @@ class TestProbUtils:
         # dataset
         assert x_kar_small < x_kar_large
 
+    @pytest.mark.unittest
+    @pytest.mark.parametrize("is_log_normal", [True, False])
+    def test_calculate_characteristic_values_from_datasets(self, is_log_normal):
+        """
+        Tests that the characteristic values of multiple datasets are equal to the values of the single datasets
+        """
+
+        # generate lognormal datasets of different lengths (mean=5, std=2)
+        log_mean, log_std = 1.53523, 0.38525
+        datasets = [np.random.lognormal(log_mean, log_std, n) for n in [10, 25, 10]]
+
+        # calculate characteristic values
+        x_kar = ProbUtils.calculate_characteristic_values_from_datasets(
+            datasets, False, True, is_log_normal
+        )
+        expected_x_kar = [
+            ProbUtils.calculate_characteristic_value_from_dataset(
+                data, False, True, is_log_normal
+            )
+            for data in datasets
+        ]
+
+        # assert
+        np.testing.assert_allclose(x_kar, expected_x_kar)
+
+    @pytest.mark.unittest
+    @pytest.mark.parametrize(
+        "datasets, error",
+        [
+            pytest.param([], "At least one dataset is required.", id="no datasets"),
+            pytest.param(
+                [[1.0, 2.0], []],
+                "Each dataset should contain at least two values.",
+                id="empty last dataset",
+            ),
+            pytest.param(
+                [[], [1.0, 2.0]],
+                "Each dataset should contain at least two values.",
+                id="empty first dataset",
+            ),
+            pytest.param(
+                [[1.0, 2.0], [1.0]],
+                "Each dataset should contain at least two values.",
+                id="single value dataset",
+            ),
+        ],
+    )
+    def test_calculate_characteristic_values_from_datasets_raises(self, datasets, error):
+        """
+        Tests that the characteristic values are not calculated for datasets with less than two values
+        """
+
+        with pytest.raises(ValueError) as excinfo:
+            ProbUtils.calculate_characteristic_values_from_datasets(datasets, False, True)
+        assert error == str(excinfo.value)
+
     @pytest.mark.unittest
     def test_calculate_prob_parameters_from_lognormal(self):
         # generate lognormal dataset (mean=5, std=2)
@@ -50,6 +50,15 @@ class TestGeolibPlusReading:
             if key not in ["predrilled_z", "undefined_depth", "water_measurement_type"]:
                 assert type(cpt_bro_xml.get(key, None)) == type(cpt_gef.get(key, None))
 
+    @pytest.mark.unittest
+    def test_plot_settings_are_not_shared(self):
+        # initialise models
+        cpt_gef = GefCpt()
+        cpt_bro_xml = BroXmlCpt()
+        # each cpt has its own plot settings
+        assert cpt_gef.plot_settings is not cpt_bro_xml.plot_settings
+        assert vars(cpt_gef.plot_settings) == vars(cpt_bro_xml.plot_settings)
+
     @pytest.mark.systemtest
     def test_has_points_with_error(self):
         # initialise models
@@ -441,6 +450,76 @@ class TestGeolibPlusReading:
         # assert friction number
         np.testing.assert_array_almost_equal(expected_friction_number, cpt.friction_nbr)
 
+    @pytest.mark.unittest
+    @pytest.mark.parametrize(
+        "depth, expected_depth",
+        [
+            ([0.0, 0.5, 1.2], [0.0, 0.5, 1.2]),
+            ([0.0, np.nan, 1.2], [0.0, 0.5, 1.0]),
+            ([], [0.0, 0.5, 1.0]),
+        ],
+    )
+    def test_calculate_depth(self, depth, expected_depth):
+        """
+        Test calculate depth, the depth is only kept if it is valid. Zero depths are valid.
+        """
+        cpt = GefCpt()
+        cpt.penetration_length = np.array([0.0, 0.5, 1.0])
+        cpt.depth = np.array(depth)
+
+        # calculate depth
+        cpt.calculate_depth()
+
+        # assert depth
+        np.testing.assert_array_almost_equal(expected_depth, cpt.depth)
+
+    @pytest.mark.unittest
+    def test_correct_for_negatives(self):
+        """
+        Test that negative values are set to zero, nan values are kept
+        """
+        data = np.array([1.0, -0.5, 0.0, np.nan, -2.0])
+
+        # correct for negatives
+        corrected_data = GefCpt._AbstractCPT__correct_for_negatives(data)
+
+        # assert corrected data
+        np.testing.assert_array_equal([1.0, 0.0, 0.0, np.nan, 0.0], corrected_data)
+        assert GefCpt._AbstractCPT__correct_for_negatives(None) is None
+
+    @pytest.mark.unittest
+    def test_update_value_with_pre_drill(self):
+        """
+        Test that the average of the first values is added for every pre-drill depth
+        """
+        values = np.array([1.0, 2.0, 3.0, 10.0])
+
+        # update values
+        updated_values = GefCpt.update_value_with_pre_drill(
+            local_depth=[0.0, 0.5], values=values, length_of_average_points=3
+        )
+
+        # assert updated values
+        np.testing.assert_array_equal([2.0, 2.0, 1.0, 2.0, 3.0, 10.0], updated_values)
+
+    @pytest.mark.unittest
+    def test_perform_pre_drill_interpretation_different_lengths_raises(self):
+        """
+        Test that the pre-drill is not filled if the properties have a different number of samples
+        """
+        cpt = GefCpt()
+        cpt.penetration_length = np.array([1.0, 1.5, 2.0])
+        cpt.depth = np.array([1.0, 1.5, 2.0])
+        cpt.tip = np.array([1.0, 2.0, 3.0])
+        cpt.friction = np.array([1.0, 2.0])
+
+        # fill pre-drill
+        with pytest.raises(ValueError) as excinfo:
+            cpt.perform_pre_drill_interpretation()
+        assert "The properties should have the same number of samples" in str(
+            excinfo.value
+        )
+
 
 class TestGeolibPlusValidate:
     @pytest.mark.systemtest